@@ -420,7 +420,8 @@ class Paragraph(BlockElement):
                             lines.append(next_line)
                             source.consume()
                         break
-                source._states = states
+                for state in states[len(source._states) :]:
+                    source.push_state(state)
         return lines
 
 
@@ -52,6 +52,7 @@ class FootnoteDef(block.BlockElement):
 
 class FootnoteRef(inline.InlineElement):
     pattern = re.compile(r"\[\^([^\]]+)\]")
+    trigger_chars = "^"
     priority = 6
 
     def __init__(self, match):
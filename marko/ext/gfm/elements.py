@@ -26,6 +26,7 @@ class Paragraph(block.Paragraph):
 
 class Strikethrough(inline.InlineElement):
     pattern = re.compile(r"(?<!~)(~|~~)([^~]+)\1(?!~)")
+    trigger_chars = "~"
     priority = 5
     parse_children = True
     parse_group = 2
@@ -6,7 +6,7 @@ from __future__ import annotations
 
 import dataclasses
 import re
-from functools import partial
+from functools import lru_cache, partial
 from importlib import import_module
 from typing import TYPE_CHECKING, overload
 
@@ -49,9 +49,10 @@ def is_paired(text: Iterable[str], open: str = "(", close: str = ")") -> bool:
     return count == 0
 
 
+@lru_cache(maxsize=256)
 def normalize_label(label: str) -> str:
     """Return the normalized form of link label."""
-    return re.sub(r"\s+", " ", label).strip().casefold()
+    return " ".join(label.split()).casefold()
 
 
 def find_next(
@@ -68,6 +69,21 @@ def find_next(
     """
     if end is None:
         end = len(text)
+    if isinstance(target, str) and (isinstance(disallowed, str) or disallowed == ()):
+        # Jump between the interesting characters instead of visiting each one.
+        pattern = _stop_chars_re(target, disallowed or "")  # type: ignore[arg-type]
+        i = start
+        while True:
+            m = pattern.search(text, i, end)
+            if m is None:
+                return -1
+            i = m.start()
+            c = text[i]
+            if c in target:
+                return i
+            if c in disallowed:
+                return -2
+            i += 2  # skip the escaped character
     i = start
     escaped = False
     while i < end:
@@ -84,6 +100,11 @@ def find_next(
     return -1
 
 
+@lru_cache()
+def _stop_chars_re(target: str, disallowed: str) -> re.Pattern[str]:
+    return re.compile("[{}]".format(re.escape(target + disallowed + "\\")))
+
+
 def partition_by_spaces(text: str, spaces: str = " \t") -> tuple[str, str, str]:
     """Split the given text by spaces or tabs, and return a tuple of
     (start, delimiter, remaining). If spaces are not found, the latter
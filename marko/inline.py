@@ -5,7 +5,7 @@ Inline(span) level elements
 from __future__ import annotations
 
 import re
-from typing import TYPE_CHECKING, Iterator, Pattern, Sequence
+from typing import TYPE_CHECKING, Any, Iterator, Pattern, Sequence
 
 from . import patterns
 from .element import Element
@@ -27,6 +27,8 @@ __all__ = (
     "RawText",
 )
 
+_email_re = re.compile(patterns.email)
+
 
 class InlineElement(Element):
     """Any inline element should inherit this class"""
@@ -44,10 +46,24 @@ class InlineElement(Element):
     virtual = False
     #: If true, will replace the element which it derives from.
     override = False
+    #: characters of which at least one must appear in the text for the pattern
+    #: to match. If empty, the pattern is always searched. It is reset when a
+    #: subclass defines its own pattern.
+    trigger_chars = ""
 
     if TYPE_CHECKING:
         children: str | Sequence[Element]
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # The inherited trigger characters don't apply to a new pattern.
+        if "pattern" in cls.__dict__ and "trigger_chars" not in cls.__dict__:
+            cls.trigger_chars = ""
+        # Compile string patterns once at class creation instead of on first use.
+        pattern = cls.__dict__.get("pattern")
+        if isinstance(pattern, str):
+            cls.pattern = re.compile(pattern)
+
     def __init__(self, match: _Match) -> None:
         """Parses the matched object into an element"""
         if not self.parse_children:
@@ -56,20 +72,23 @@ class InlineElement(Element):
     @classmethod
     def find(cls, text: str, *, source: Source) -> Iterator[_Match]:
         """This method should return an iterable containing matches of this element."""
-        if isinstance(cls.pattern, str):
-            cls.pattern = re.compile(cls.pattern)
-        return cls.pattern.finditer(text)
+        if cls.trigger_chars and not any(c in text for c in cls.trigger_chars):
+            return iter(())
+        return cls.pattern.finditer(text)  # type: ignore[union-attr]
 
 
 class Literal(InlineElement):
     """Literal escapes need to be parsed at the first."""
 
     priority = 7
+    trigger_chars = "\\"
     pattern = re.compile(r'\\([!"#\$%&\'()*+,\-./:;<=>?@\[\\\]^_`{|}~])')
 
     @classmethod
     def strip_backslash(cls, text: str) -> str:
-        return cls.pattern.sub(r"\1", text)  # type: ignore[unio]
+        if "\\" not in text:
+            return text
+        return cls.pattern.sub(r"\1", text)  # type: ignore[union-attr]
 
 
 class LineBreak(InlineElement):
@@ -80,22 +99,26 @@ class LineBreak(InlineElement):
     """
 
     priority = 2
+    trigger_chars = "\n"
     pattern = r"( *|\\)\n(?!\Z)"
 
     def __init__(self, match: _Match) -> None:
-        self.soft = not match.group(1).startswith(("  ", "\\"))
+        # group 1 is either a run of spaces or a single backslash
+        prefix = match.group(1)
+        self.soft = len(prefix) < 2 and prefix != "\\"
         self.children = "\n"
 
 
 class InlineHTML(InlineElement):
     priority = 7
+    trigger_chars = "<"
     pattern = re.compile(
         r"(<%s(?:%s)* */?>"  # open tag
         r"|</%s *>"  # closing tag
-        r"|<!--(?:>|->|[\s\S]*?-->)"  # HTML comment
-        r"|<\?[\s\S]*?\?>"  # processing instruction
-        r"|<![A-Z]+ +[\s\S]*?>"  # declaration
-        r"|<!\[CDATA\[[\s\S]*?\]\]>)"  # CDATA section
+        r"|<!--(?:>|->|[^-]*(?:-(?!->)[^-]*)*-->)"  # HTML comment
+        r"|<\?[^?]*(?:\?(?!>)[^?]*)*\?>"  # processing instruction
+        r"|<![A-Z]+ +[^>]*>"  # declaration
+        r"|<!\[CDATA\[[^\]]*(?:\](?!\]>)[^\]]*)*\]\]>)"  # CDATA section
         % (patterns.tag_name, patterns.attribute, patterns.tag_name)
     )
 
@@ -121,14 +144,7 @@ class Link(InlineElement):
     parse_children = True
 
     def __init__(self, match: _Match) -> None:
-        if match.group(2) and match.group(2)[0] == "<" and match.group(2)[-1] == ">":
-            self.dest = match.group(2)[1:-1]
-        else:
-            self.dest = match.group(2) or ""
-        self.dest = Literal.strip_backslash(self.dest)
-        self.title = (
-            Literal.strip_backslash(match.group(3)[1:-1]) if match.group(3) else None
-        )
+        self.dest, self.title = _get_dest_and_title(match)
 
 
 class Image(InlineElement):
@@ -138,37 +154,45 @@ class Image(InlineElement):
     parse_children = True
 
     def __init__(self, match: _Match) -> None:
-        if match.group(2) and match.group(2)[0] == "<" and match.group(2)[-1] == ">":
-            self.dest = match.group(2)[1:-1]
-        else:
-            self.dest = match.group(2) or ""
-        self.dest = Literal.strip_backslash(self.dest)
-        self.title = (
-            Literal.strip_backslash(match.group(3)[1:-1]) if match.group(3) else None
-        )
+        self.dest, self.title = _get_dest_and_title(match)
+
+
+def _get_dest_and_title(match: _Match) -> tuple[str, str | None]:
+    """Extract the unescaped destination and title from a link or image match."""
+    dest = match.group(2) or ""
+    if dest[:1] == "<" and dest[-1:] == ">":
+        dest = dest[1:-1]
+    title = match.group(3)
+    return (
+        Literal.strip_backslash(dest),
+        Literal.strip_backslash(title[1:-1]) if title else None,
+    )
 
 
 class CodeSpan(InlineElement):
     """Inline code span: `code sample`"""
 
     priority = 7
+    trigger_chars = "`"
     pattern = re.compile(r"(?<!`)(`+)(?!`)([\s\S]+?)(?<!`)\1(?!`)")
 
     def __init__(self, match: _Match) -> None:
-        self.children = match.group(2).replace("\n", " ")
-        if self.children.strip() and self.children[0] == self.children[-1] == " ":
-            self.children = self.children[1:-1]
+        children = match.group(2).replace("\n", " ")
+        if children[0] == children[-1] == " " and children.strip():
+            children = children[1:-1]
+        self.children = children
 
 
 class AutoLink(InlineElement):
     """Autolinks: <http://example.org>"""
 
     priority = 7
+    trigger_chars = "<"
     pattern = re.compile(rf"<({patterns.uri}|{patterns.email})>")
 
     def __init__(self, match: _Match) -> None:
         self.dest = match.group(1)
-        if re.match(patterns.email, self.dest):
+        if _email_re.match(self.dest):
             self.dest = "mailto:" + self.dest
         self.children = [RawText(match.group(1))]
         self.title = ""
@@ -4,11 +4,12 @@ Parse inline elements
 
 from __future__ import annotations
 
+import operator
 import re
-from typing import TYPE_CHECKING, Match, NamedTuple, Union
+from typing import TYPE_CHECKING, Any, Match, NamedTuple, Union
 
 from . import patterns
-from .helpers import find_next, is_paired, normalize_label
+from .helpers import find_next, normalize_label
 from .inline import InlineElement
 
 if TYPE_CHECKING:
@@ -28,6 +29,20 @@ class Group(NamedTuple):
 _EMPTY_GROUP = Group(-1, -1, None)
 WHITESPACE = " \n\t"
 ASCII_CONTROL = "".join(chr(i) for i in range(0, 32)) + chr(127)
+# Characters that may start an escape, a code span, a delimiter run or
+# a closing bracket.
+_special_re = re.compile(r"[\\`!\[*_\]]")
+# The token starting at one of those characters.
+_token_re = re.compile(
+    r"\\[\s\S]"  # escaped character
+    r"|(?<!`)(`+)(?!`)[\s\S]+?(?<!`)\1(?!`)"  # code span
+    r"|`+"  # unmatched backtick run
+    r"|!?\["  # link or image opener
+    r"|\*+|_+"  # delimiter run
+    r"|\]"  # closing bracket
+)
+# The characters that matter when scanning a link destination without brackets.
+_link_dest_re = re.compile(r"\\[\s\S]|[()\x00-\x20\x7f]")
 
 
 class ParseError(ValueError):
@@ -44,41 +59,60 @@ def parse(
     :param fallback: fallback class when no other element type is matched.
     """
 
-    class LinkOrEmph(InlineElement):
-        parse_children = True
-
-        def __new__(cls, match: _Match) -> InlineElement:  # type: ignore
-            assert isinstance(match, MatchObj)
-            return source.parser.inline_elements[match.etype](match)
-
     # A raw list of elements that may contain overlaps.
     tokens: list[Token] = []
-    for m in find_links_or_emphs(text, source.root.link_ref_defs):
-        tokens.append(Token(LinkOrEmph, m, text, fallback))
+    matches = find_links_or_emphs(text, source.root.link_ref_defs)
+    if matches:
+
+        class LinkOrEmph(InlineElement):
+            parse_children = True
+
+            def __new__(cls, match: _Match) -> InlineElement:  # type: ignore
+                assert isinstance(match, MatchObj)
+                return source.parser.inline_elements[match.etype](match)
+
+        tokens.extend(Token(LinkOrEmph, m) for m in matches)
 
     for etype in elements:
         for match in etype.find(text, source=source):
-            tokens.append(Token(etype, match, text, fallback))
-    tokens.sort()
+            tokens.append(Token(etype, match))
+    if not tokens:
+        # Plain text, skip building the element tree.
+        return [fallback(text)] if text else []  # type: ignore
+    tokens.sort(key=operator.attrgetter("start"))
     tokens = _resolve_overlap(tokens)
     return make_elements(tokens, text, fallback=fallback)
 
 
 def _resolve_overlap(tokens: list[Token]) -> list[Token]:
-    if not tokens:
-        return tokens
-    result = []
-    prev = tokens[0]
-    for cur in tokens[1:]:
-        r = prev.relation(cur)
-        if r == Token.PRECEDE:
-            result.append(prev)
-            prev = cur
-        elif r == Token.CONTAIN:
-            prev.append_child(cur)
-        elif r == Token.INTERSECT and prev.etype.priority < cur.etype.priority:
-            prev = cur
-    result.append(prev)
+    """Drop the overlapping tokens and nest the contained ones as children.
+
+    ``tokens`` must be sorted by start position. ``stack`` holds the last kept
+    token of each nesting level, so a token is compared with the innermost
+    possible container first instead of descending from the top level each time.
+    """
+    result: list[Token] = []
+    stack: list[Token] = []
+    for cur in tokens:
+        level = len(stack)
+        r = Token.PRECEDE
+        while level > 0:
+            rel = stack[level - 1].relation(cur)
+            if rel == Token.CONTAIN:
+                break
+            r = rel
+            level -= 1
+        siblings = stack[level - 1].children if level > 0 else result
+        if level < len(stack):
+            # r is the relation between cur and the last token of this level
+            prev = stack[level]
+            if r == Token.INTERSECT and prev.etype.priority < cur.etype.priority:
+                siblings.pop()
+            elif r != Token.PRECEDE:
+                continue
+            del stack[level:]
+        siblings.append(cur)
+        stack.append(cur)
     return result
 
 
@@ -100,21 +134,37 @@ def make_elements(
     :returns: a list of inline elements.
     """
     result: list[InlineElement] = []
-    end = end or len(text)
-    prev_end = start
-    for token in tokens:
-        if prev_end < token.start:
-            result.append(fallback(text[prev_end : token.start]))  # type: ignore
-        result.append(token.as_element())
-        prev_end = token.end
-    if prev_end < end:
-        result.append(fallback(text[prev_end:end]))  # type: ignore
+    # Walk the token tree with an explicit stack so that deeply nested elements
+    # don't exhaust the recursion limit. Each frame holds the remaining tokens,
+    # the list to fill, the end of the last token and the end of the range.
+    stack: list[list[Any]] = [[iter(tokens), result, start, end or len(text)]]
+    while stack:
+        frame = stack[-1]
+        it, elements, prev_end, stop = frame
+        for token in it:
+            if prev_end < token.start:
+                elements.append(fallback(text[prev_end : token.start]))  # type: ignore
+            e = token.etype(token.match)
+            elements.append(e)
+            prev_end = token.end
+            if e.parse_children:
+                frame[2] = prev_end
+                children: list[InlineElement] = []
+                e.children = children
+                stack.append(
+                    [iter(token.children), children, token.inner_start, token.inner_end]
+                )
+                break
+        else:
+            if prev_end < stop:
+                elements.append(fallback(text[prev_end:stop]))  # type: ignore
+            stack.pop()
     return result
 
 
 class Token:
     """An intermediate class to wrap the match object.
-    It can be converted to element by :meth:`as_element()`
+    Tokens are converted to elements by :func:`make_elements()`.
     """
 
     PRECEDE = 0
@@ -122,51 +172,35 @@ class Token:
     CONTAIN = 2
     SHADE = 3
 
-    def __init__(
-        self, etype: ElementType, match: _Match, text: str, fallback: ElementType
-    ) -> None:
+    __slots__ = (
+        "etype",
+        "match",
+        "start",
+        "end",
+        "inner_start",
+        "inner_end",
+        "children",
+    )
+
+    def __init__(self, etype: ElementType, match: _Match) -> None:
         self.etype = etype
         self.match = match
         self.start = match.start()
         self.end = match.end()
         self.inner_start = match.start(etype.parse_group)
         self.inner_end = match.end(etype.parse_group)
-        self.text = text
-        self.fallback = fallback
         self.children: list[Token] = []
 
     def relation(self, other: Token) -> int:
         if self.end <= other.start:
             return Token.PRECEDE
-        if self.end >= other.end:
-            if (
-                self.etype.parse_children
-                and other.start >= self.inner_start
-                and other.end <= self.inner_end
-            ):
+        if self.end >= other.end and self.etype.parse_children:
+            if self.inner_start <= other.start and other.end <= self.inner_end:
                 return Token.CONTAIN
-            if self.etype.parse_children and self.inner_end <= other.start:
+            if self.inner_end <= other.start:
                 return Token.SHADE
         return Token.INTERSECT
 
-    def append_child(self, child: Token) -> None:
-        if not self.etype.parse_children:
-            return
-        self.children.append(child)
-
-    def as_element(self) -> InlineElement:
-        e = self.etype(self.match)
-        if e.parse_children:
-            self.children = _resolve_overlap(self.children)
-            e.children = make_elements(
-                self.children,
-                self.text,
-                self.inner_start,
-                self.inner_end,
-                self.fallback,
-            )
-        return e
-
     def __repr__(self) -> str:
         return "<{}: {} start={} end={}>".format(
             self.__class__.__name__, self.etype.__name__, self.start, self.end
@@ -185,54 +219,51 @@ def find_links_or_emphs(
     :param link_ref_defs: a mapping of link ref definitions.
     :returns: an iterable of match object.
     """
-    delimiters_re = re.compile(r"(?:!?\[|\*+|_+)")
-    i = 0
-    delimiters: list[Delimiter] = []
-    escape = False
+    delimiters = DelimiterStack()
     matches: list[MatchObj] = []
-    code_pattern = re.compile(r"(?<!`)(`+)(?!`)([\s\S]+?)(?<!`)\1(?!`)")
-
-    while i < len(text):
-        if escape:
-            escape = False
-            i += 1
-        elif text[i] == "\\":
-            escape = True
-            i += 1
-        elif code_pattern.match(text, i):
-            i = code_pattern.match(text, i).end()  # type: ignore
-        elif text[i] == "]":
-            node = look_for_image_or_link(text, delimiters, i, link_ref_defs, matches)
+    special = _special_re.search(text)
+    while special is not None:
+        start = special.start()
+        m = _token_re.match(text, start)
+        if m is None:  # a "!" not followed by "["
+            special = _special_re.search(text, start + 1)
+            continue
+        pos = m.end()
+        if text[start] in "![":
+            delimiters.append(Delimiter(m, text))
+        elif text[start] in "*_":
+            d = Delimiter(m, text)
+            # A run that can neither open nor close never takes part in emphasis.
+            if d.can_open or d.can_close:
+                delimiters.append(d)
+        elif text[start] == "]":
+            node = look_for_image_or_link(
+                text, delimiters, start, link_ref_defs, matches
+            )
             if node:
-                i = node.end()
+                pos = node.end()
                 matches.append(node)
-            else:
-                i += 1
-        else:
-            m = delimiters_re.match(text, i)
-            if m:
-                delimiters.append(Delimiter(m, text))
-                i = m.end()
-            else:
-                i += 1
+        special = _special_re.search(text, pos)
     process_emphasis(text, delimiters, None, matches)
     return matches
 
 
 def look_for_image_or_link(
     text: str,
-    delimiters: list[Delimiter],
+    delimiters: DelimiterStack,
     close: int,
     link_ref_defs: dict[str, tuple[str, str]],
     matches: list[MatchObj],
 ) -> MatchObj | None:
-    for i, d in list(enumerate(delimiters))[::-1]:
+    d = delimiters.top
+    while d is not None:
         if d.content not in ("[", "!["):
+            d = d.prev
             continue
         if not d.active:
             break  # break to remove the delimiter and return None
-        if not _is_legal_link_text(text[d.end : close]):
-            break
+        # Brackets inside the link text are balanced: every "]" in between has
+        # taken an opener above this one off the stack.
         link_text = Group(d.end, close, text[d.end : close])
         assert link_text.text is not None
         etype = "Image" if d.content == "![" else "Link"
@@ -242,26 +273,24 @@ def look_for_image_or_link(
         if not match:  # not a link
             break
         rv = MatchObj(etype, text, d.start, match[2], link_text, match[0], match[1])
-        process_emphasis(text, delimiters, i, matches)
+        process_emphasis(text, delimiters, d, matches)
         if etype == "Link":
-            for d in delimiters[:i]:
-                if d.content == "[":
-                    d.active = False
-        del delimiters[i]
+            prev = d.prev
+            while prev is not None:
+                if prev.content == "[":
+                    prev.active = False
+                prev = prev.prev
+        delimiters.remove(d)
         return rv
 
     else:
         # no matching opener is found
         return None
 
-    del delimiters[i]
+    delimiters.remove(d)
     return None
 
 
-def _is_legal_link_text(text: str) -> bool:
-    return is_paired(text, "[", "]")
-
-
 def _parse_link_separator(text: str, start: int) -> int:
     i = start
     has_newline = False
@@ -300,16 +329,12 @@ def _parse_link_dest_title(
         i = right_bracket + 1
         link_dest = Group(start, i, link_text[start:i])
     else:
-        escaped = False
         pairs = 0
-        i = start
-        while i < len(link_text):
-            c = link_text[i]
-            if escaped:
-                escaped = False
-            elif c == "\\":
-                escaped = True
-            elif c in WHITESPACE:
+        # Escaped characters match as two-character strings and fall through.
+        for m in _link_dest_re.finditer(link_text, start):
+            c = m.group()
+            if c in WHITESPACE:
+                i = m.start()
                 break
             elif c in ASCII_CONTROL:
                 raise ParseError("Invalid character in link destination")
@@ -319,14 +344,15 @@ def _parse_link_dest_title(
                 if pairs > 0:
                     pairs -= 1
                 elif is_inline:
+                    i = m.start()
                     link_dest = Group(start, i, link_text[start:i])
                     return link_dest, _EMPTY_GROUP
                 else:
                     raise ParseError("unmatched parenthesis")
-            i += 1
         else:
             if is_inline:
                 raise ParseError("No right parenthesis is found")
+            i = len(link_text)
         link_dest = Group(start, i, link_text[start:i])
         if not link_dest.text:
             raise ParseError("Empty link destination")
@@ -392,142 +418,166 @@ def _expect_reference_link(
 def _get_reference_link(
     link_label: str, link_ref_defs: dict[str, tuple[str, str]]
 ) -> tuple[str, str] | None:
+    if len(link_label) > 999:  # too long to be a link label
+        return None
     normalized_label = normalize_label(link_label)
     return link_ref_defs.get(normalized_label)
 
 
 def process_emphasis(
     text: str,
-    delimiters: list[Delimiter],
-    stack_bottom: int | None,
+    delimiters: DelimiterStack,
+    stack_bottom: Delimiter | None,
     matches: list[MatchObj],
 ) -> None:
-    star_bottom = underscore_bottom = stack_bottom
-    cur = _next_closer(delimiters, stack_bottom)
-    while cur is not None:
-        d_closer = delimiters[cur]
-        bottom = star_bottom if d_closer.content[0] == "*" else underscore_bottom
-        opener = _nearest_opener(delimiters, cur, bottom)
+    # Where the search for openers stops, for each kind of closer.
+    openers_bottom: dict[tuple[str, bool, int], Delimiter | None] = {}
+    closer = _next_closer(
+        stack_bottom.next if stack_bottom is not None else delimiters.bottom
+    )
+    while closer is not None:
+        kind = (closer.content[0], closer.can_open, closer.length % 3)
+        opener = _nearest_opener(
+            closer, stack_bottom, openers_bottom.get(kind, stack_bottom)
+        )
         if opener is not None:
-            d_opener = delimiters[opener]
-            n = 2 if len(d_opener.content) >= 2 and len(d_closer.content) >= 2 else 1
+            n = 2 if len(opener.content) >= 2 and len(closer.content) >= 2 else 1
             match = MatchObj(
                 "StrongEmphasis" if n == 2 else "Emphasis",
                 text,
-                d_opener.end - n,
-                d_closer.start + n,
-                Group(
-                    d_opener.end, d_closer.start, text[d_opener.end : d_closer.start]
-                ),
+                opener.end - n,
+                closer.start + n,
+                # The text is sliced on demand, see MatchObj.group().
+                Group(opener.end, closer.start, None),
             )
             matches.append(match)
-            del delimiters[opener + 1 : cur]
-            cur -= cur - opener - 1
-            if d_opener.remove(n):
-                delimiters.remove(d_opener)
-                cur -= 1
-            if d_closer.remove(n, True):
-                delimiters.remove(d_closer)
-            cur = cur - 1 if cur > 0 else None
+            delimiters.remove_between(opener, closer)
+            if opener.remove(n):
+                delimiters.remove(opener)
+            if closer.remove(n, True):
+                next_closer = closer.next
+                delimiters.remove(closer)
+                closer = next_closer
         else:
-            bottom = cur - 1 if cur > 1 else None
-            if d_closer.content[0] == "*":
-                star_bottom = bottom
-            else:
-                underscore_bottom = bottom
-            if not d_closer.can_open:
-                delimiters.remove(d_closer)
-        cur = _next_closer(delimiters, cur)
-    lower = stack_bottom + 1 if stack_bottom is not None else 0
-    del delimiters[lower:]
-
-
-def _next_closer(delimiters: list[Delimiter], bound: int | None) -> int | None:
-    i = bound + 1 if bound is not None else 0
-    while i < len(delimiters):
-        d = delimiters[i]
-        if getattr(d, "can_close", False):
-            return i
-        i += 1
-    return None
+            openers_bottom[kind] = closer.prev
+            next_closer = closer.next
+            if not closer.can_open:
+                delimiters.remove(closer)
+            closer = next_closer
+        closer = _next_closer(closer)
+    delimiters.truncate(stack_bottom)
+
+
+def _next_closer(d: Delimiter | None) -> Delimiter | None:
+    while d is not None and not d.can_close:
+        d = d.next
+    return d
 
 
 def _nearest_opener(
-    delimiters: list[Delimiter], higher: int, lower: int | None
-) -> int | None:
-    i = higher - 1
-    lower = lower if lower is not None else -1
-    while i > lower:
-        d = delimiters[i]
-        if getattr(d, "can_open", False) and d.closed_by(delimiters[higher]):
-            return i
-        i -= 1
+    closer: Delimiter, stack_bottom: Delimiter | None, bottom: Delimiter | None
+) -> Delimiter | None:
+    d = closer.prev
+    while d is not None and d is not stack_bottom and d is not bottom:
+        if d.can_open and d.closed_by(closer):
+            return d
+        d = d.prev
     return None
 
 
-class Delimiter:
-    whitespace_re = re.compile(r"\s", flags=re.UNICODE)
+class DelimiterStack:
+    """The delimiter stack, kept as a doubly linked list so that delimiters
+    can be removed from the middle without shifting the ones above them.
+    """
 
-    def __init__(self, match: _Match, text: str) -> None:
-        self.start = match.start()
-        self.end = match.end()
-        self.content = match.group()
-        self.text = text
-        self.active = True
-        if self.content[0] in ("*", "_"):
-            self.can_open = self._can_open()
-            self.can_close = self._can_close()
-
-    def _can_open(self) -> bool:
-        if self.content[0] == "*":
-            return self.is_left_flanking()
-        return self.is_left_flanking() and (
-            not self.is_right_flanking() or self.preceded_by_punc()
-        )
+    __slots__ = ("bottom", "top")
 
-    def _can_close(self) -> bool:
-        if self.content[0] == "*":
-            return self.is_right_flanking()
-        return self.is_right_flanking() and (
-            not self.is_left_flanking() or self.followed_by_punc()
-        )
+    def __init__(self) -> None:
+        self.bottom: Delimiter | None = None
+        self.top: Delimiter | None = None
 
-    def is_left_flanking(self) -> bool:
-        return (
-            self.end < len(self.text)
-            and self.whitespace_re.match(self.text, self.end) is None
-        ) and (
-            not self.followed_by_punc()
-            or self.start == 0
-            or self.preceded_by_punc()
-            or self.whitespace_re.match(self.text, self.start - 1) is not None
-        )
+    def append(self, d: Delimiter) -> None:
+        d.prev = self.top
+        d.next = None
+        if self.top is None:
+            self.bottom = d
+        else:
+            self.top.next = d
+        self.top = d
 
-    def is_right_flanking(self) -> bool:
-        return (
-            self.start > 0
-            and self.whitespace_re.match(self.text, self.start - 1) is None
-        ) and (
-            not self.preceded_by_punc()
-            or self.end == len(self.text)
-            or self.followed_by_punc()
-            or self.whitespace_re.match(self.text, self.end) is not None
-        )
+    def remove(self, d: Delimiter) -> None:
+        if d.prev is None:
+            self.bottom = d.next
+        else:
+            d.prev.next = d.next
+        if d.next is None:
+            self.top = d.prev
+        else:
+            d.next.prev = d.prev
 
-    def followed_by_punc(self) -> bool:
-        return self.end < len(self.text) and patterns.is_punctuation(
-            self.text[self.end]
-        )
+    def remove_between(self, lower: Delimiter, upper: Delimiter) -> None:
+        """Remove all delimiters between ``lower`` and ``upper``, exclusive."""
+        lower.next = upper
+        upper.prev = lower
+
+    def truncate(self, bottom: Delimiter | None) -> None:
+        """Remove all delimiters above ``bottom``, or all of them if it is None."""
+        if bottom is None:
+            self.bottom = self.top = None
+        else:
+            bottom.next = None
+            self.top = bottom
+
+
+class Delimiter:
+    __slots__ = (
+        "start",
+        "end",
+        "content",
+        "active",
+        "can_open",
+        "can_close",
+        "length",
+        "prev",
+        "next",
+    )
 
-    def preceded_by_punc(self) -> bool:
-        return self.start > 0 and patterns.is_punctuation(self.text[self.start - 1])
+    def __init__(self, match: _Match, text: str) -> None:
+        self.prev: Delimiter | None = None
+        self.next: Delimiter | None = None
+        start = self.start = match.start()
+        end = self.end = match.end()
+        content = self.content = match.group()
+        self.length = len(content)
+        self.active = True
+        if content[0] in ("*", "_"):
+            # The beginning and the end of the text count as whitespace.
+            before = text[start - 1] if start > 0 else " "
+            after = text[end] if end < len(text) else " "
+            before_space, after_space = before.isspace(), after.isspace()
+            before_punc = patterns.is_punctuation(before)
+            after_punc = patterns.is_punctuation(after)
+            left_flanking = not after_space and (
+                not after_punc or before_space or before_punc
+            )
+            right_flanking = not before_space and (
+                not before_punc or after_space or after_punc
+            )
+            if content[0] == "*":
+                self.can_open = left_flanking
+                self.can_close = right_flanking
+            else:
+                self.can_open = left_flanking and (not right_flanking or before_punc)
+                self.can_close = right_flanking and (not left_flanking or after_punc)
+        else:
+            self.can_open = self.can_close = False
 
     def closed_by(self, other: Delimiter) -> bool:
         return not (
             self.content[0] != other.content[0]
             or (self.can_open and self.can_close or other.can_open and other.can_close)
-            and len(self.content + other.content) % 3 == 0
-            and not all(len(d.content) % 3 == 0 for d in [self, other])
+            and (self.length + other.length) % 3 == 0
+            and not (self.length % 3 == 0 and other.length % 3 == 0)
         )
 
     def remove(self, n: int, left: bool = False) -> bool:
@@ -549,6 +599,8 @@ class Delimiter:
 class MatchObj:
     """A fake match object that memes re.match methods"""
 
+    __slots__ = ("_text", "_start", "_end", "_groups", "etype")
+
     def __init__(
         self, etype: str, text: str, start: int, end: int, *groups: Group
     ) -> None:
@@ -561,7 +613,10 @@ class MatchObj:
     def group(self, n: int = 0) -> str:
         if n == 0:
             return self._text[self._start : self._end]
-        return self._groups[n - 1][2]  # type: ignore
+        start, end, text = self._groups[n - 1]
+        if text is None and start >= 0:
+            return self._text[start:end]
+        return text  # type: ignore
 
     def start(self, n: int = 0) -> int:
         if n == 0:
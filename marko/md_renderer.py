@@ -4,9 +4,8 @@ Markdown renderer
 
 from __future__ import annotations
 
-import re
 from contextlib import contextmanager
-from typing import TYPE_CHECKING, Generator, cast
+from typing import TYPE_CHECKING, Any, Generator, cast
 
 from .renderer import Renderer
 
@@ -26,12 +25,19 @@ class MarkdownRenderer(Renderer):
         super().__init__()
         self._prefix = ""
         self._second_prefix = ""
+        self._ref_labels_root: block.Document | None = None
+        self._ref_labels: dict[tuple[str, str | None], str] = {}
 
     def __enter__(self) -> MarkdownRenderer:
         self._prefix = ""
         self._second_prefix = ""
         return super().__enter__()
 
+    def __exit__(self, *args: Any) -> None:
+        self._ref_labels_root = None
+        self._ref_labels = {}
+        super().__exit__(*args)
+
     @contextmanager
     def container(
         self, prefix: str, second_prefix: str = ""
@@ -142,14 +148,13 @@ class MarkdownRenderer(Renderer):
             '"{}"'.format(element.title.replace('"', '\\"')) if element.title else None
         )
         assert self.root_node
-        label = next(
-            (
-                k
-                for k, v in self.root_node.link_ref_defs.items()
-                if v == (element.dest, link_title)
-            ),
-            None,
-        )
+        if self._ref_labels_root is not self.root_node:
+            # Map each (dest, title) to the first label defining it.
+            self._ref_labels = {}
+            for k, v in self.root_node.link_ref_defs.items():
+                self._ref_labels.setdefault(v, k)
+            self._ref_labels_root = self.root_node
+        label = self._ref_labels.get((element.dest, link_title))
         if label is not None:
             if label == link_text:
                 return f"[{label}]"
@@ -171,9 +176,12 @@ class MarkdownRenderer(Renderer):
         return f"\\{element.children}"
 
     def render_raw_text(self, element: inline.RawText) -> str:
+        if element.children.isascii():  # no CJK characters to separate
+            return element.children
+
         from .ext.pangu import PANGU_RE
 
-        return re.sub(PANGU_RE, " ", element.children)
+        return PANGU_RE.sub(" ", element.children)
 
     def render_line_break(self, element: inline.LineBreak) -> str:
         return "\n" if element.soft else "\\\n"
@@ -4,7 +4,8 @@ Base parser
 
 from __future__ import annotations
 
-import itertools
+import functools
+import operator
 from typing import TYPE_CHECKING, Type, cast
 
 from .source import Source
@@ -23,14 +24,15 @@ class Parser:
     """
 
     def __init__(self) -> None:
-        self.block_elements: dict[str, BlockElementType] = {}
-        self.inline_elements: dict[str, InlineElementType] = {}
-
-        for el in itertools.chain(
-            (getattr(block, name) for name in block.__all__),
-            (getattr(inline, name) for name in inline.__all__),
-        ):
-            self.add_element(el)
+        default_block, default_inline = _default_elements()
+        self.block_elements: dict[str, BlockElementType] = dict(default_block)
+        self.inline_elements: dict[str, InlineElementType] = dict(default_inline)
+        # The element lists are rebuilt whenever the dicts above change, so that
+        # editing them directly takes effect as well as add_element().
+        self._block_element_key: tuple[BlockElementType, ...] = ()
+        self._block_element_list: list[BlockElementType] = []
+        self._inline_element_key: tuple[InlineElementType, ...] = ()
+        self._inline_element_list: list[InlineElementType] = []
 
     def add_element(self, element: ElementType) -> None:
         """Add an element to the parser.
@@ -114,17 +116,43 @@ class Parser:
 
     def _build_block_element_list(self) -> list[BlockElementType]:
         """Return a list of block elements, ordered from highest priority to lowest."""
-        return sorted(
-            (e for e in self.block_elements.values() if not e.virtual),
-            key=lambda e: e.priority,
-            reverse=True,
-        )
+        key = tuple(self.block_elements.values())
+        if key != self._block_element_key:
+            self._block_element_key = key
+            self._block_element_list = sorted(
+                (e for e in key if not e.virtual),
+                key=operator.attrgetter("priority"),
+                reverse=True,
+            )
+        return self._block_element_list
 
     def _build_inline_element_list(self) -> list[InlineElementType]:
         """Return a list of elements, each item is a list of elements
         with the same priority.
         """
-        return [e for e in self.inline_elements.values() if not e.virtual]
+        key = tuple(self.inline_elements.values())
+        if key != self._inline_element_key:
+            self._inline_element_key = key
+            self._inline_element_list = [e for e in key if not e.virtual]
+        return self._inline_element_list
+
+
+@functools.lru_cache(maxsize=None)
+def _default_elements() -> (
+    tuple[dict[str, BlockElementType], dict[str, InlineElementType]]
+):
+    """Return the name: element maps of the built-in elements.
+    They are resolved once and copied by every new parser.
+    """
+    block_elements: dict[str, BlockElementType] = {}
+    for name in block.__all__:
+        el = getattr(block, name)
+        block_elements[el.get_type()] = el
+    inline_elements: dict[str, InlineElementType] = {}
+    for name in inline.__all__:
+        el = getattr(inline, name)
+        inline_elements[el.get_type()] = el
+    return block_elements, inline_elements
 
 
 from . import block, element, inline, inline_parser  # noqa
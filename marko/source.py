@@ -14,6 +14,10 @@ if TYPE_CHECKING:
     from marko.parser import Parser
 
 
+# A whole line including the trailing newline, if any.
+_line_re = re.compile(r"[^\n]*$\n?", flags=re.M)
+
+
 def _preprocess_text(text: str) -> str:
     return text.replace("\r\n", "\n")
 
@@ -21,6 +25,17 @@ def _preprocess_text(text: str) -> str:
 class Source:
     """Wrapper class on content to be parsed"""
 
+    __slots__ = (
+        "_buffer",
+        "pos",
+        "_anchor",
+        "_states",
+        "_prefix",
+        "match",
+        "context",
+        "parser",
+    )
+
     parser: Parser
 
     def __init__(self, text: str) -> None:
@@ -28,6 +43,7 @@ class Source:
         self.pos = 0
         self._anchor = 0
         self._states: list[BlockElement] = []
+        self._prefix: str | None = None
         self.match: Match[str] | None = None
         #: Store temporary data during parsing.
         self.context = types.SimpleNamespace()
@@ -49,9 +65,11 @@ class Source:
     def push_state(self, element: BlockElement) -> None:
         """Push a new state to the state stack."""
         self._states.append(element)
+        self._prefix = None
 
     def pop_state(self) -> BlockElement:
         """Pop the top most state."""
+        self._prefix = None
         return self._states.pop()
 
     @contextmanager
@@ -69,7 +87,9 @@ class Source:
     @property
     def prefix(self) -> str:
         """The prefix of each line when parsing."""
-        return "".join(s._prefix for s in self._states)
+        if self._prefix is None:
+            self._prefix = "".join(s._prefix for s in self._states)
+        return self._prefix
 
     def _expect_re(self, regexp: Pattern[str] | str, pos: int) -> Match[str] | None:
         if isinstance(regexp, str):
@@ -83,16 +103,29 @@ class Source:
         return the position of the end of prefix.
         If the prefix is not matched, return -1.
         """
-        m = re.match(prefix, line.expandtabs(4))
+        if not prefix:
+            return 0
+        pattern = _compile_prefix(prefix)
+        m = pattern.match(line.expandtabs(4))
         if not m:
-            if re.match(prefix, line.expandtabs(4).replace("\n", " " * 99 + "\n")):
+            if pattern.match(line.expandtabs(4).replace("\n", " " * 99 + "\n")):
                 return len(line) - 1
             return -1
         pos = m.end()
-        if pos == 0:
-            return 0
-        for i in range(1, len(line) + 1):
-            if len(line[:i].expandtabs(4)) >= pos:
+        if pos == 0 or "\t" not in line:
+            return pos
+        # Find the shortest head of the line that is at least pos long
+        # when tabs are expanded, like len(line[:i].expandtabs(4)) >= pos.
+        width = column = 0
+        for i, c in enumerate(line, 1):
+            if c == "\t":
+                n = 4 - column % 4
+                width += n
+                column += n
+            else:
+                width += 1
+                column = 0 if c in "\r\n" else column + 1
+            if width >= pos:
                 return i
         return -1  # pragma: no cover
 
@@ -101,9 +134,13 @@ class Source:
         :param regexp: the expression to be tested.
         :returns: the match object.
         """
-        prefix_len = self.match_prefix(
-            self.prefix, self.next_line(require_prefix=False)  # type: ignore
-        )
+        prefix = self.prefix
+        if not prefix:  # nothing to strip at the top level
+            prefix_len = 0
+        else:
+            prefix_len = self.match_prefix(
+                prefix, self.next_line(require_prefix=False)  # type: ignore
+            )
         if prefix_len >= 0:
             match = self._expect_re(regexp, self.pos + prefix_len)
             self.match = match
@@ -125,9 +162,9 @@ class Source:
             is not matched.
         """
         if require_prefix:
-            m = self.expect_re(r"(?m)[^\n]*?$\n?")
+            m = self.expect_re(_line_re)
         else:
-            m = self._expect_re(r"(?m)[^\n]*$\n?", self.pos)
+            m = _line_re.match(self._buffer, self.pos)
         self.match = m
         if m:
             return m.group()
@@ -150,6 +187,12 @@ class Source:
         self.pos = self._anchor
 
     def _update_prefix(self) -> None:
+        self._prefix = None
         for s in self._states:
             if hasattr(s, "_second_prefix"):
                 s._prefix = s._second_prefix  # type: ignore
+
+
+@functools.lru_cache
+def _compile_prefix(prefix: str) -> Pattern[str]:
+    return re.compile(prefix)
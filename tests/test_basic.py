@@ -1,10 +1,11 @@
 #! -*- coding: utf-8 -*-
+import re
 import textwrap
 
 import pytest
 
 import marko
-from marko import block
+from marko import block, inline, inline_parser
 from marko.ast_renderer import ASTRenderer, XMLRenderer
 from marko.md_renderer import MarkdownRenderer
 from tests.normalize import normalize_html
@@ -58,6 +59,55 @@ class TestBasic:
         rerendered = markdown.convert(text)
         assert rerendered == text
 
+    def test_markdown_renderer_link_ref_first_label(self):
+        text = "[a][2] and [b][1]\n\n[1]: /x\n[2]: /x\n"
+        markdown = marko.Markdown(renderer=MarkdownRenderer)
+        assert markdown.convert(text) == "[a][1] and [b][1]\n\n[1]: /x\n[2]: /x\n"
+        assert markdown.renderer._ref_labels_root is None
+        assert markdown.renderer._ref_labels == {}
+
+    def test_deeply_nested_emphasis(self):
+        depth = 200
+        text = "*a " * depth + "b" + " a*" * depth
+        res = marko.convert(text)
+        assert res.count("<em>") == res.count("</em>") == depth
+        assert "<em>a <em>a " in res
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("*a b_ c*", "<p><em>a b_ c</em></p>\n"),
+            ("*_ __ .*", "<p><em>_ __ .</em></p>\n"),
+            (" *_ _    aa* _", "<p><em>_ _    aa</em> _</p>\n"),
+            (
+                "_*__**__  . __**.*****_",
+                "<p>_*<strong>**</strong>  . _<em><strong>.</strong>***</em></p>\n",
+            ),
+            ("*****_*.**********_ab_", "<p>*****_<em>.</em>*********<em>ab</em></p>\n"),
+        ],
+    )
+    def test_emphasis_delimiter_stack(self, text, expected):
+        assert marko.convert(text) == expected
+
+    def test_link_text_with_bracket_in_code_span(self):
+        res = marko.convert("[a `]` b](x)")
+        assert res == '<p><a href="x">a <code>]</code> b</a></p>\n'
+
+    def test_reference_link_label_too_long(self):
+        label, long_label = "a" * 999, "a" * 1000
+        link_ref_defs = {label: ("x", ""), long_label: ("y", "")}
+        assert inline_parser._get_reference_link(label, link_ref_defs) == ("x", "")
+        assert inline_parser._get_reference_link(long_label, link_ref_defs) is None
+
+    def test_parse_nesting_beyond_recursion_limit(self):
+        depth = 2000
+        doc = marko.parse("*a " * depth + "b" + " a*" * depth)
+        element = doc.children[0].children[0]  # type: ignore
+        for _ in range(depth - 1):
+            assert isinstance(element, inline.Emphasis)
+            element = element.children[1]  # type: ignore
+        assert element.children[0].children == "a b a"  # type: ignore
+
 
 class TestExtension:
     def test_extension_use(self):
@@ -110,6 +160,73 @@ class TestExtension:
         assert markdown.parser.block_elements["MyHeading"] is MyHeading
         assert markdown.parser.block_elements["MyHeading"].get_type() == "MyHeading"
 
+    def test_add_element_after_parsing(self):
+        class MyHeading(block.Heading):
+            override = True
+
+        parser = marko.Parser()
+        parser.parse("# hello\n")
+        parser.add_element(MyHeading)
+        assert MyHeading in parser._build_block_element_list()
+        assert block.Heading not in parser._build_block_element_list()
+        assert isinstance(parser.parse("# hello\n").children[0], MyHeading)
+
+    def test_edit_elements_after_parsing(self):
+        class MyHeading(block.Heading):
+            override = True
+
+        parser = marko.Parser()
+        parser.parse("# hello\n")
+        parser.block_elements["Heading"] = MyHeading
+        assert isinstance(parser.parse("# hello\n").children[0], MyHeading)
+        del parser.inline_elements["CodeSpan"]
+        paragraph = parser.parse("`code`\n").children[0]
+        assert not any(isinstance(c, inline.CodeSpan) for c in paragraph.children)
+
+    def test_inline_element_string_pattern(self):
+        class GitHubWiki(inline.InlineElement):
+            pattern = r"\[\[ *(.+?) *\| *(.+?) *\]\]"
+            parse_children = True
+
+            def __init__(self, match):
+                self.target = match.group(2)
+
+        assert isinstance(GitHubWiki.pattern, re.Pattern)
+        assert "pattern" not in vars(inline.Emphasis)
+
+        my_extension = marko.MarkoExtension(elements=[GitHubWiki])
+
+        markdown = marko.Markdown(extensions=[my_extension])
+        doc = markdown.parse("[[Page 2|target]]")
+        wiki = doc.children[0].children[0]
+        assert isinstance(wiki, GitHubWiki)
+        assert wiki.target == "target"
+
+    def test_inline_element_trigger_chars(self):
+        class GitHubWiki(inline.InlineElement):
+            pattern = r"\[\[ *(.+?) *\| *(.+?) *\]\]"
+            trigger_chars = "["
+
+        assert list(GitHubWiki.find("Page 2|target", source=None)) == []
+        assert len(list(GitHubWiki.find("[[Page 2|target]]", source=None))) == 1
+
+    def test_inline_element_trigger_chars_reset_by_pattern(self):
+        class BareLink(inline.AutoLink):
+            override = True
+            pattern = re.compile(r"(https?://\S+)")
+
+        class MyAutoLink(inline.AutoLink):
+            override = True
+
+        assert BareLink.trigger_chars == ""
+        assert MyAutoLink.trigger_chars == inline.AutoLink.trigger_chars == "<"
+
+        my_extension = marko.MarkoExtension(elements=[BareLink])
+        markdown = marko.Markdown(extensions=[my_extension])
+        assert markdown.convert("see https://example.com") == (
+            '<p>see <a href="https://example.com">https://example.com</a></p>\n'
+        )
+
     def test_extension_with_illegal_element(self):
         my_extension = marko.MarkoExtension(elements=[object])  # type: ignore
 
@@ -31,6 +31,23 @@ def test_is_not_paired(raw_string):
     assert not helpers.is_paired(raw_string)
 
 
+@pytest.mark.parametrize(
+    "args, expected",
+    [
+        (("foo]bar", "]"), 3),
+        ((r"foo\]bar]", "]"), 8),
+        (("foo\\\\]bar", "]"), 5),
+        (("foo[bar]", "]", 0, None, "["), -2),
+        (("foo]bar", "]", 0, 3), -1),
+        (("foo\\", "]"), -1),
+        (("<foo\nbar>", ">", 1, None, "<\n"), -2),
+        (("foo]bar", {"]"}), 3),
+    ],
+)
+def test_find_next(args, expected):
+    assert helpers.find_next(*args) == expected
+
+
 def test_source_no_state():
     source = marko.source.Source("hello world")
 
@@ -41,6 +58,20 @@ def test_source_no_state():
         source.state
 
 
+@pytest.mark.parametrize(
+    "prefix, line, expected",
+    [
+        (r" {,3}>[^\n\S]?", "> foo\n", 2),
+        (" {4}", "\tfoo\n", 1),
+        (" {2}", "\tfoo\n", 1),
+        (" {,3}> {6}", ">\t\tfoo\n", 3),
+        (">", "foo\n", -1),
+    ],
+)
+def test_source_match_prefix(prefix, line, expected):
+    assert marko.source.Source.match_prefix(prefix, line) == expected
+
+
 def test_load_extension_object():
     ext = helpers.load_extension("pangu")
     assert len(ext.renderer_mixins) == 1
@@ -72,3 +103,16 @@ def test_load_illegal_extension_object():
 )
 def test_partition_by_spaces(text, expected):
     assert helpers.partition_by_spaces(text) == expected
+
+
+@pytest.mark.parametrize(
+    "label, expected",
+    [
+        ("Foo", "foo"),
+        ("  foo \t bar\n", "foo bar"),
+        ("ẞ", "ss"),
+        ("foo　bar", "foo bar"),
+    ],
+)
+def test_normalize_label(label, expected):
+    assert helpers.normalize_label(label) == expected